@@ -5,13 +5,26 @@ import logging
 
 import voluptuous as vol
 
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import config_validation as cv
+from homeassistant.const import ATTR_ENTITY_ID, CONF_PASSWORD, CONF_USERNAME, Platform
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
 from homeassistant.config_entries import ConfigEntry
 
 from .api import API
-from .const import DOMAIN
+from .const import (
+    ATTR_SCENE,
+    ATTR_SECONDS,
+    CONF_LIFE2_URL,
+    CONF_UCENTER_URL,
+    DEFAULT_LIFE2_URL,
+    DEFAULT_UCENTER_URL,
+    DOMAIN,
+    SERVICE_PROFILE,
+    SERVICE_RESTORE,
+    SERVICE_SNAPSHOT,
+)
+from .profiler import async_profile
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,13 +41,72 @@ CONFIG_SCHEMA = vol.Schema(
 )
 PLATFORMS = [Platform.LIGHT]
 
+SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_SCENE): cv.string,
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+    }
+)
+RESTORE_SCHEMA = vol.Schema({vol.Required(ATTR_SCENE): cv.string})
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SECONDS, default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=300)
+        )
+    }
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, config: ConfigEntry) -> bool:
     """Set up the platform API."""
     _LOGGER.info("Setup SengledNG package")
 
-    api = API(hass, config.data[CONF_USERNAME], config.data[CONF_PASSWORD])
+    api = API(
+        hass,
+        config.data[CONF_USERNAME],
+        config.data[CONF_PASSWORD],
+        ucenter_url=config.data.get(CONF_UCENTER_URL, DEFAULT_UCENTER_URL),
+        life2_url=config.data.get(CONF_LIFE2_URL, DEFAULT_LIFE2_URL),
+    )
     hass.data[DOMAIN] = api
     hass.async_create_background_task(api.async_start(), "SengledNG")
+    _async_register_services(hass, api)
 
     return True
+
+
+def _async_register_services(hass: HomeAssistant, api: API) -> None:
+    """Scene snapshot/restore and profiling services."""
+
+    async def async_snapshot(call: ServiceCall) -> None:
+        light_ids = None
+        if ATTR_ENTITY_ID in call.data:
+            registry = er.async_get(hass)
+            light_ids = set()
+            for entity_id in call.data[ATTR_ENTITY_ID]:
+                entry = registry.async_get(entity_id)
+                if not entry or entry.platform != DOMAIN:
+                    raise HomeAssistantError(
+                        "{} is not a Sengled light".format(entity_id)
+                    )
+                light_ids.add(entry.unique_id)
+        await api.async_snapshot(call.data[ATTR_SCENE], light_ids)
+
+    async def async_restore(call: ServiceCall) -> None:
+        scene = call.data[ATTR_SCENE]
+        if not api.has_scene(scene):
+            raise HomeAssistantError("Unknown scene {}".format(scene))
+        await api.async_restore(scene)
+
+    async def async_profile_service(call: ServiceCall) -> None:
+        await async_profile(hass, call.data[ATTR_SECONDS])
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SNAPSHOT, async_snapshot, schema=SNAPSHOT_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_RESTORE, async_restore, schema=RESTORE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile_service, schema=PROFILE_SCHEMA
+    )
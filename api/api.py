@@ -15,16 +15,35 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.typing import DiscoveryInfoType
 
-from ..const import DOMAIN
+from ..const import DEFAULT_LIFE2_URL, DEFAULT_UCENTER_URL, DOMAIN
 from .api_bulb import APIBulb
 
 _LOGGER = logging.getLogger(__name__)
 
+# Fall back to polling device/list.json once MQTT has failed this many times
+# in a row. A connection only counts as recovered once it has stayed up for
+# MQTT_STABLE_AFTER seconds, so a broker that accepts and then drops every
+# session still ends up polled. Polls come POLL_INTERVAL_MIN seconds after a
+# change, then back off by doubling while nothing changes: 15, 30, ... 300.
+POLL_AFTER_FAILURES = 2
+POLL_INTERVAL_MIN = 15
+POLL_INTERVAL_MAX = 300
+POLL_TIMEOUT = 10
+RECONNECT_DELAY = 10
+MQTT_STABLE_AFTER = 60
+
 
 class AuthError(Exception):
     """Something went wrong with login."""
 
 
+def _next_poll_interval(interval: int | None, changed: bool) -> int:
+    """How long to wait before the next poll, given the last wait."""
+    if changed or interval is None:
+        return POLL_INTERVAL_MIN
+    return min(interval * 2, POLL_INTERVAL_MAX)
+
+
 class API:
     """API for Sengled"""
 
@@ -33,24 +52,37 @@ class API:
     _jsession_id: str | None = None
     _lights: dict[str, APIBulb]
     _mqtt: mqtt.Client | None = None
+    _mqtt_failures: int = 0
+    _poller: asyncio.Task | None = None
+    _scenes: dict[str, dict[str, dict[str, str]]]
 
-    def __init__(self, hass: HomeAssistant, username: str, password: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        username: str,
+        password: str,
+        ucenter_url: str = DEFAULT_UCENTER_URL,
+        life2_url: str = DEFAULT_LIFE2_URL,
+    ) -> None:
         self._hass = hass
         self._username = username
         self._password = password
+        self._ucenter_url = ucenter_url.rstrip("/")
+        self._life2_url = life2_url.rstrip("/")
 
         self._lights = {}
+        self._scenes = {}
         self._lights_mutex = asyncio.Lock()
         self._cookiejar = aiohttp.CookieJar()
         self._http = aiohttp.ClientSession(cookie_jar=self._cookiejar)
 
     @staticmethod
-    async def check_auth(username, password):
+    async def check_auth(username, password, ucenter_url=DEFAULT_UCENTER_URL):
         """See if it'll work."""
-        await API(None, username, password)._async_login()
+        await API(None, username, password, ucenter_url=ucenter_url)._async_login()
 
     async def _async_login(self):
-        url = "https://ucenter.cloud.sengled.com/user/app/customer/v2/AuthenCross.json"
+        url = "{}/user/app/customer/v2/AuthenCross.json".format(self._ucenter_url)
         # For Zigbee? login_path = "/zigbee/customer/login.json"
         payload = {
             "uuid": uuid.uuid4().hex[:-16],
@@ -72,7 +104,7 @@ class API:
 
     async def _async_get_server_info(self):
         """Get secondary server info from the primary."""
-        url = "https://life2.cloud.sengled.com/life2/server/getServerInfo.json"
+        url = "{}/life2/server/getServerInfo.json".format(self._life2_url)
         async with self._http.post(url) as resp:
             data = await resp.json()
             _LOGGER.debug("Raw server info %r", data)
@@ -82,11 +114,12 @@ class API:
 
     async def _async_setup_mqtt(self):
         """Setup up MQTT client."""
+        secure = self._inception_url.scheme == "wss"
         client = mqtt.Client(
             self._inception_url.hostname,
-            self._inception_url.port,
+            self._inception_url.port or (443 if secure else 80),
             client_id="{}@lifeApp".format(self._jsession_id),
-            tls_context=ssl.create_default_context(),
+            tls_context=ssl.create_default_context() if secure else None,
             transport="websockets",
             websocket_headers={
                 "Cookie": "JSESSIONID={}".format(self._jsession_id),
@@ -104,33 +137,113 @@ class API:
             await self._subscribe_light(light)
         _LOGGER.info("MQTT client ready")
 
+    async def _async_list_devices(
+        self, timeout: float | None = None
+    ) -> list[DiscoveryInfoType]:
+        """Fetch every device and its attributes in one request."""
+        url = "{}/life2/device/list.json".format(self._life2_url)
+        kwargs = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+        async with self._http.post(url, **kwargs) as resp:
+            data = await resp.json()
+            return data["deviceList"]
+
     async def _async_discover_lights(self) -> list[DiscoveryInfoType]:
         """Get a list of HASS-friendly discovered devices."""
-        url = "https://life2.cloud.sengled.com/life2/device/list.json"
-        async with self._http.post(url) as resp:
-            data = await resp.json()
-            for device in data["deviceList"]:
-                self._hass.helpers.discovery.load_platform(
-                    Platform.LIGHT, DOMAIN, device, {}
-                )
+        for device in await self._async_list_devices():
+            self._hass.helpers.discovery.load_platform(
+                Platform.LIGHT, DOMAIN, device, {}
+            )
         _LOGGER.info("API discovery complete")
 
+    async def _async_poll_lights(self, previous: dict[str, Any]) -> bool:
+        """Push polled attributes through update_bulb, returning if any changed."""
+        changed = False
+        for device in await self._async_list_devices(POLL_TIMEOUT):
+            light_id = device["deviceUuid"]
+            attributes = device["attributeList"]
+            if previous.get(light_id) == attributes:
+                continue
+            previous[light_id] = attributes
+            async with self._lights_mutex:
+                light = self._lights.get(light_id)
+            if light:
+                light.update_bulb(
+                    [
+                        {"type": item["name"], "value": item["value"]}
+                        for item in attributes
+                    ]
+                )
+                changed = True
+        return changed
+
+    async def _poll_loop(self):
+        """Keep state approximately fresh while MQTT is down."""
+        _LOGGER.warning("MQTT unavailable, polling for state")
+        interval = None
+        previous = {}
+        while True:
+            try:
+                changed = await self._async_poll_lights(previous)
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                KeyError,
+                ValueError,
+            ) as error:
+                _LOGGER.info("Polling failed %r", error)
+                changed = False
+            interval = _next_poll_interval(interval, changed)
+            await asyncio.sleep(interval)
+
     async def async_start(self):
         """Start the API's main event loop."""
         await self._async_login()
         await self._async_get_server_info()
         await self._async_discover_lights()
 
-        while True:
-            try:
-                await self._async_setup_mqtt()
-                await self._message_loop()
-            except mqtt.error.MqttConnectError as conerr:
-                _LOGGER.info("MQTT refused, reauthenticating %r", conerr)
-                await self._async_login()
-            except mqtt.MqttError as error:
-                _LOGGER.info("MQTT dropped, waiting to reconnect %r", error)
-                await asyncio.sleep(10)
+        try:
+            while True:
+                try:
+                    await self._async_setup_mqtt()
+                    stable = asyncio.get_running_loop().call_later(
+                        MQTT_STABLE_AFTER, self._mqtt_stable
+                    )
+                    try:
+                        await self._message_loop()
+                    finally:
+                        stable.cancel()
+                except mqtt.error.MqttConnectError as conerr:
+                    _LOGGER.info("MQTT refused, reauthenticating %r", conerr)
+                    self._mqtt_failures += 1
+                    try:
+                        await self._async_login()
+                    except (
+                        aiohttp.ClientError,
+                        asyncio.TimeoutError,
+                        AuthError,
+                    ) as err:
+                        _LOGGER.info("Login failed, waiting to retry %r", err)
+                        await asyncio.sleep(RECONNECT_DELAY)
+                except mqtt.MqttError as error:
+                    _LOGGER.info("MQTT dropped, waiting to reconnect %r", error)
+                    self._mqtt_failures += 1
+                    await asyncio.sleep(RECONNECT_DELAY)
+                if self._mqtt_failures >= POLL_AFTER_FAILURES and not self._poller:
+                    self._poller = self._hass.async_create_background_task(
+                        self._poll_loop(), "SengledNG polling"
+                    )
+        finally:
+            if self._poller:
+                self._poller.cancel()
+                self._poller = None
+
+    def _mqtt_stable(self):
+        """MQTT has stayed up long enough to trust it again."""
+        self._mqtt_failures = 0
+        if self._poller:
+            self._poller.cancel()
+            self._poller = None
+            _LOGGER.warning("MQTT restored, stopped polling")
 
     async def _message_loop(self):
         async with self._mqtt.messages() as messages:
@@ -176,6 +289,41 @@ class API:
             return
         light.update_bulb(payload)
 
+    async def async_snapshot(self, scene: str, light_ids: set[str] | None = None):
+        """Capture the state of some (or all) lights under a scene name."""
+        async with self._lights_mutex:
+            self._scenes[scene] = {
+                light_id: light.snapshot()
+                for light_id, light in self._lights.items()
+                if light_ids is None or light_id in light_ids
+            }
+        _LOGGER.info("Captured scene %s of %d lights", scene, len(self._scenes[scene]))
+
+    def has_scene(self, scene: str) -> bool:
+        """Whether a scene has been captured."""
+        return scene in self._scenes
+
+    async def async_restore(self, scene: str):
+        """Restore a captured scene, sending only what changed."""
+        if scene not in self._scenes:
+            raise KeyError("Unknown scene {}".format(scene))
+        async with self._lights_mutex:
+            targets = [
+                (self._lights[light_id], snapshot)
+                for light_id, snapshot in self._scenes[scene].items()
+                if light_id in self._lights
+            ]
+        sent = await asyncio.gather(
+            *(light.async_restore(snapshot) for light, snapshot in targets)
+        )
+        _LOGGER.info(
+            "Restored scene %s: %d attributes to %d of %d lights",
+            scene,
+            sum(sent),
+            sum(1 for count in sent if count),
+            len(targets),
+        )
+
     async def shutdown(self):
         """Shutdown and tidy up."""
         await self._http.close()
@@ -7,6 +7,14 @@ class APIBulb:
         """Deliver an update packet to the bulb."""
         raise NotImplementedError("Bulbs must implement update_bulb")
 
+    def snapshot(self) -> dict[str, str]:
+        """Capture the restorable state in compact form."""
+        raise NotImplementedError("Bulbs must implement snapshot")
+
+    async def async_restore(self, snapshot: dict[str, str]) -> int:
+        """Send only what differs from snapshot, returning the attribute count."""
+        raise NotImplementedError("Bulbs must implement async_restore")
+
     async def set_brightness(self, value: int) -> None:
         """Set the brightness."""
         raise NotImplementedError("Bulbs must implement set_brightness")
@@ -22,6 +22,15 @@ PACKET_SWITCH: Final = "switch"
 PACKET_VALUE_OFF: Final = "0"
 PACKET_VALUE_ON: Final = "1"
 
+SCENE_ATTRIBUTES: Final = (
+    PACKET_SWITCH,
+    PACKET_BRIGHTNESS,
+    PACKET_COLOR_MODE,
+    PACKET_RGB_COLOR,
+    PACKET_COLOR_TEMP,
+)
+COLOR_MODE_VALUES: Final = {"1": PACKET_RGB_COLOR, "2": PACKET_COLOR_TEMP}
+
 HA_COLOR_MODE_BRIGHTNESS = "brightness"
 HA_COLOR_MODE_COLOR_TEMP = "color_temp"
 HA_COLOR_MODE_RGB = "rgb"
@@ -58,6 +67,31 @@ def _encode_color_temp(value_mireds: int, min_mireds: int, max_mireds: int) -> s
     return str(math.ceil((max_mireds - value_mireds) / (max_mireds - min_mireds) * 100))
 
 
+def _restore_updates(
+    current: dict[str, str], snapshot: dict[str, str]
+) -> list[dict[str, str]]:
+    """Build the minimal update packets to bring current back to snapshot."""
+    if snapshot.get(PACKET_SWITCH) == PACKET_VALUE_OFF:
+        # Touching anything else would switch the bulb on again.
+        if current.get(PACKET_SWITCH) == PACKET_VALUE_OFF:
+            return []
+        return [{"type": PACKET_SWITCH, "value": PACKET_VALUE_OFF}]
+
+    updates = []
+    for key in (PACKET_SWITCH, PACKET_BRIGHTNESS):
+        if key in snapshot and current.get(key) != snapshot[key]:
+            updates.append({"type": key, "value": snapshot[key]})
+
+    # The bulb switches color mode by itself when sent a color or temperature.
+    mode = snapshot.get(PACKET_COLOR_MODE)
+    key = COLOR_MODE_VALUES.get(mode)
+    if key in snapshot and (
+        current.get(PACKET_COLOR_MODE) != mode or current.get(key) != snapshot[key]
+    ):
+        updates.append({"type": key, "value": snapshot[key]})
+    return updates
+
+
 class ElementsBulb(APIBulb):
     """A Wifi Elements bulb."""
 
@@ -132,6 +166,15 @@ class ElementsBulb(APIBulb):
             [message | extras for message in messages],
         )
 
+    def snapshot(self) -> dict[str, str]:
+        return {key: self._data[key] for key in SCENE_ATTRIBUTES if key in self._data}
+
+    async def async_restore(self, snapshot: dict[str, str]) -> int:
+        updates = _restore_updates(self._data, snapshot)
+        if updates:
+            await self._async_send_updates(*updates)
+        return len(updates)
+
     def update_bulb(self, payload):
         packet = {}
         for item in payload:
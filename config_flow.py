@@ -7,14 +7,27 @@ from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.selector import (
+    TextSelector,
+    TextSelectorConfig,
+    TextSelectorType,
+)
 
 import voluptuous as vol
 
 from .api import API, AuthError
-from .const import DOMAIN
+from .const import (
+    CONF_LIFE2_URL,
+    CONF_UCENTER_URL,
+    DEFAULT_LIFE2_URL,
+    DEFAULT_UCENTER_URL,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+URL_SELECTOR = TextSelector(TextSelectorConfig(type=TextSelectorType.URL))
+
 
 class SengledNGConfigFlow(ConfigFlow, domain=DOMAIN):
     """Example config flow."""
@@ -28,9 +41,22 @@ class SengledNGConfigFlow(ConfigFlow, domain=DOMAIN):
         """Handle a flow initiated by the user."""
         errors = {}
         if user_input is not None:
+            user_input = {
+                CONF_UCENTER_URL: DEFAULT_UCENTER_URL,
+                CONF_LIFE2_URL: DEFAULT_LIFE2_URL,
+            } | user_input
+            for key in (CONF_UCENTER_URL, CONF_LIFE2_URL):
+                try:
+                    user_input[key] = cv.url(user_input[key])
+                except vol.Invalid:
+                    errors[key] = "invalid_url"
+
+        if user_input is not None and not errors:
             try:
                 await API.check_auth(
-                    user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
+                    user_input[CONF_USERNAME],
+                    user_input[CONF_PASSWORD],
+                    ucenter_url=user_input[CONF_UCENTER_URL],
                 )
                 return self.async_create_entry(title=DOMAIN, data=user_input)
             except AuthError:
@@ -40,6 +66,14 @@ class SengledNGConfigFlow(ConfigFlow, domain=DOMAIN):
             vol.Required(CONF_USERNAME): cv.string,
             vol.Required(CONF_PASSWORD): cv.string,
         }
+        if self.show_advanced_options:
+            # Only for pointing at a stand-in cloud such as the test fake.
+            data_schema[
+                vol.Optional(CONF_UCENTER_URL, default=DEFAULT_UCENTER_URL)
+            ] = URL_SELECTOR
+            data_schema[
+                vol.Optional(CONF_LIFE2_URL, default=DEFAULT_LIFE2_URL)
+            ] = URL_SELECTOR
 
         return self.async_show_form(
             step_id="user",
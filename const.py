@@ -5,3 +5,14 @@ from typing import Final
 
 ATTRIBUTION: Final = "Data provided by SengledNG"
 DOMAIN: Final = "sengledng"
+
+CONF_LIFE2_URL: Final = "life2_url"
+CONF_UCENTER_URL: Final = "ucenter_url"
+DEFAULT_LIFE2_URL: Final = "https://life2.cloud.sengled.com"
+DEFAULT_UCENTER_URL: Final = "https://ucenter.cloud.sengled.com"
+
+ATTR_SCENE: Final = "scene"
+ATTR_SECONDS: Final = "seconds"
+SERVICE_PROFILE: Final = "profile"
+SERVICE_RESTORE: Final = "restore"
+SERVICE_SNAPSHOT: Final = "snapshot"
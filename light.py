@@ -119,4 +119,5 @@ async def async_setup_platform(
     light = pick_light(discovery_info)(api, discovery_info)
     await api.async_register_light(light)
     add_entities([light])
-    _LOGGER.info("Discovered light %r", light)
+    _LOGGER.info("Discovered light %s (%s)", light.name, light.unique_id)
+    _LOGGER.debug("Discovered light %r", light)
@@ -0,0 +1,57 @@
+"""On-demand profiling of the SengledNG hot paths."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+HOT_PATHS = r"_message_loop|_handle_status|_async_send_updates"
+
+_lock = asyncio.Lock()
+
+
+async def async_profile(hass: HomeAssistant, seconds: float) -> str:
+    """Profile the event loop for a fixed window and write a report."""
+    if _lock.locked():
+        raise HomeAssistantError("Profiling already running")
+
+    async with _lock:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as err:
+            # Python 3.12+ allows only one profiler at a time, e.g. HA's own.
+            raise HomeAssistantError(
+                "Cannot profile while another profiler is running"
+            ) from err
+        _LOGGER.warning("Profiling for %s seconds", seconds)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+
+        path = hass.config.path("{}_profile_{}.txt".format(DOMAIN, int(time.time())))
+        await hass.async_add_executor_job(_write_report, profiler, seconds, path)
+        _LOGGER.warning("Profile written to %s", path)
+        return path
+
+
+def _write_report(profiler: cProfile.Profile, seconds: float, path: str) -> None:
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out).sort_stats(pstats.SortKey.CUMULATIVE)
+    out.write("SengledNG profile over {} seconds\n\n".format(seconds))
+    stats.print_stats(HOT_PATHS)
+    stats.print_callees(HOT_PATHS)
+    stats.print_stats(40)
+    with open(path, "w", encoding="utf-8") as report:
+        report.write(out.getvalue())
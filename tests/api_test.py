@@ -0,0 +1,278 @@
+import asyncio
+from types import SimpleNamespace
+
+from ..api import api as api_module
+from ..api import API, AuthError, ElementsColorBulb
+
+from .fixtures.fake_cloud import FakeSengledCloud
+
+
+class _Bulb(ElementsColorBulb):
+    def __init__(self, api, discovery) -> None:
+        super().__init__(discovery)
+        self._api = api
+
+
+def _hass(discovered):
+    """Just enough of hass for API: discovery and background tasks."""
+
+    def load_platform(platform, domain, device, config):
+        discovered.append(device)
+
+    loop = asyncio.get_running_loop()
+    return SimpleNamespace(
+        helpers=SimpleNamespace(discovery=SimpleNamespace(load_platform=load_platform)),
+        async_create_background_task=lambda coro, name: loop.create_task(coro),
+    )
+
+
+async def _wait_for(predicate, timeout=5):
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+async def _wait_for_subscribed(cloud, count):
+    """Wait until a live MQTT session holds count subscriptions."""
+    await _wait_for(
+        lambda: any(
+            len(session.subscriptions) >= count and not session.ws.closed
+            for session in cloud._sessions
+        )
+    )
+    # Let the API get from its last SUBACK into the message loop.
+    await asyncio.sleep(0.1)
+
+
+async def _register(api, discovered):
+    bulbs = [_Bulb(api, device) for device in discovered]
+    for bulb in bulbs:
+        await api.async_register_light(bulb)
+    return bulbs
+
+
+def test_round_trip_against_fake_cloud():
+    async def run():
+        cloud = FakeSengledCloud(bulb_count=3)
+        await cloud.start()
+        discovered = []
+        api = API(_hass(discovered), "user", "pwd", cloud.url, cloud.url)
+        try:
+            await api._async_login()
+            await api._async_get_server_info()
+            await api._async_discover_lights()
+            assert len(discovered) == 3
+
+            bulbs = await _register(api, discovered)
+            await api._async_setup_mqtt()
+            loop_task = asyncio.create_task(api._message_loop())
+            await asyncio.sleep(0.1)
+
+            await bulbs[0].set_power(True)
+            await _wait_for(lambda: bulbs[0].is_on)
+            assert cloud.bulbs[bulbs[0].unique_id].attributes["switch"] == "1"
+            assert not bulbs[1].is_on
+
+            loop_task.cancel()
+            await api._mqtt.disconnect()
+        finally:
+            await api.shutdown()
+            await cloud.stop()
+
+    asyncio.run(run())
+
+
+def test_reconnect_after_expired_session(monkeypatch):
+    monkeypatch.setattr(api_module, "RECONNECT_DELAY", 0)
+
+    async def run():
+        cloud = FakeSengledCloud(bulb_count=2)
+        await cloud.start()
+        discovered = []
+        api = API(_hass(discovered), "user", "pwd", cloud.url, cloud.url)
+        start_task = asyncio.create_task(api.async_start())
+        try:
+            await _wait_for(lambda: len(discovered) == 2)
+            bulbs = await _register(api, discovered)
+            await _wait_for_subscribed(cloud, 2)
+
+            cloud.expire_sessions()
+            await cloud.drop_clients()
+            await _wait_for(lambda: cloud.stats["connect_refused"] >= 1)
+            await _wait_for(lambda: cloud.stats["connect"] >= 3)
+            assert cloud.stats["login"] == 2
+            await _wait_for_subscribed(cloud, 2)
+
+            await bulbs[1].set_power(True)
+            await _wait_for(lambda: bulbs[1].is_on)
+        finally:
+            start_task.cancel()
+            await asyncio.gather(start_task, return_exceptions=True)
+            await api.shutdown()
+            await cloud.stop()
+
+    asyncio.run(run())
+
+
+def test_polls_while_mqtt_flaps_then_hands_back(monkeypatch):
+    monkeypatch.setattr(api_module, "RECONNECT_DELAY", 0.05)
+    monkeypatch.setattr(api_module, "POLL_INTERVAL_MIN", 0.05)
+    monkeypatch.setattr(api_module, "MQTT_STABLE_AFTER", 0.5)
+
+    async def run():
+        cloud = FakeSengledCloud(bulb_count=2)
+        await cloud.start()
+        discovered = []
+        api = API(_hass(discovered), "user", "pwd", cloud.url, cloud.url)
+        start_task = asyncio.create_task(api.async_start())
+        try:
+            await _wait_for(lambda: len(discovered) == 2)
+            bulbs = await _register(api, discovered)
+
+            # The broker accepts each session and then drops it straight away.
+            for _ in range(api_module.POLL_AFTER_FAILURES):
+                await _wait_for_subscribed(cloud, 2)
+                assert api._poller is None
+                await cloud.drop_clients()
+            await _wait_for(lambda: api._poller is not None)
+            poller = api._poller
+
+            # Changed behind MQTT's back, so only polling can pick it up.
+            cloud.bulbs[bulbs[0].unique_id].attributes["switch"] = "1"
+            await _wait_for(lambda: bulbs[0].is_on)
+
+            await _wait_for(lambda: api._poller is None)
+            await asyncio.sleep(0)
+            assert poller.cancelled()
+            assert api._mqtt_failures == 0
+        finally:
+            start_task.cancel()
+            await asyncio.gather(start_task, return_exceptions=True)
+            await api.shutdown()
+            await cloud.stop()
+
+    asyncio.run(run())
+
+
+def test_failed_relogin_keeps_running(monkeypatch):
+    monkeypatch.setattr(api_module, "RECONNECT_DELAY", 0)
+
+    async def run():
+        cloud = FakeSengledCloud(bulb_count=1)
+        await cloud.start()
+        discovered = []
+        api = API(_hass(discovered), "user", "pwd", cloud.url, cloud.url)
+        start_task = asyncio.create_task(api.async_start())
+        try:
+            await _wait_for(lambda: len(discovered) == 1)
+            bulbs = await _register(api, discovered)
+            await _wait_for_subscribed(cloud, 1)
+
+            login = api._async_login
+            failed = []
+
+            async def flaky_login():
+                if not failed:
+                    failed.append(True)
+                    raise AuthError("Cloud is down")
+                await login()
+
+            api._async_login = flaky_login
+            cloud.expire_sessions()
+            await cloud.drop_clients()
+            await _wait_for(lambda: cloud.stats["connect_refused"] >= 2)
+            await _wait_for(lambda: cloud.stats["login"] == 2)
+            assert failed and not start_task.done()
+            await _wait_for_subscribed(cloud, 1)
+
+            await bulbs[0].set_power(True)
+            await _wait_for(lambda: bulbs[0].is_on)
+        finally:
+            start_task.cancel()
+            await asyncio.gather(start_task, return_exceptions=True)
+            await api.shutdown()
+            await cloud.stop()
+
+    asyncio.run(run())
+
+
+def _device(uuid, switch):
+    return {
+        "deviceUuid": uuid,
+        "attributeList": [{"name": "switch", "value": switch}],
+    }
+
+
+class _RecordingBulb:
+    def __init__(self):
+        self.updates = []
+
+    def update_bulb(self, payload):
+        self.updates.append(payload)
+
+
+def test_poll_feeds_only_changed_lights():
+    async def run():
+        api = API(_hass([]), "user", "pwd")
+        bulbs = {"a": _RecordingBulb(), "b": _RecordingBulb()}
+        api._lights.update(bulbs)
+        responses = [
+            [_device("a", "0"), _device("b", "0"), _device("unknown", "1")],
+            [_device("a", "1"), _device("b", "0")],
+            [_device("a", "1"), _device("b", "0")],
+        ]
+
+        async def list_devices(timeout=None):
+            return responses.pop(0)
+
+        api._async_list_devices = list_devices
+        previous = {}
+        try:
+            assert await api._async_poll_lights(previous)
+            assert await api._async_poll_lights(previous)
+            assert not await api._async_poll_lights(previous)
+        finally:
+            await api.shutdown()
+        assert bulbs["a"].updates == [
+            [{"type": "switch", "value": "0"}],
+            [{"type": "switch", "value": "1"}],
+        ]
+        assert bulbs["b"].updates == [[{"type": "switch", "value": "0"}]]
+
+    asyncio.run(run())
+
+
+def test_next_poll_interval():
+    assert api_module._next_poll_interval(None, False) == 15
+    assert api_module._next_poll_interval(None, True) == 15
+    assert api_module._next_poll_interval(15, False) == 30
+    assert api_module._next_poll_interval(240, True) == 15
+    assert api_module._next_poll_interval(240, False) == 300
+    assert api_module._next_poll_interval(300, False) == 300
+
+
+def test_poll_loop_survives_timeouts(monkeypatch):
+    monkeypatch.setattr(api_module, "POLL_INTERVAL_MIN", 0.01)
+
+    async def run():
+        api = API(_hass([]), "user", "pwd")
+        calls = []
+
+        async def list_devices(timeout=None):
+            calls.append(timeout)
+            if len(calls) == 1:
+                raise asyncio.TimeoutError()
+            return []
+
+        api._async_list_devices = list_devices
+        poller = asyncio.create_task(api._poll_loop())
+        try:
+            await _wait_for(lambda: len(calls) >= 2)
+        finally:
+            poller.cancel()
+            await api.shutdown()
+        assert calls[0] == api_module.POLL_TIMEOUT
+
+    asyncio.run(run())
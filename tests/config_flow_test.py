@@ -0,0 +1,62 @@
+import asyncio
+
+import voluptuous_serialize
+
+from homeassistant.helpers import config_validation as cv
+
+from .. import config_flow
+from ..const import CONF_LIFE2_URL, CONF_UCENTER_URL, DEFAULT_UCENTER_URL
+
+
+def _flow(advanced):
+    flow = config_flow.SengledNGConfigFlow()
+    flow.context = {"source": "user", "show_advanced_options": advanced}
+    return flow
+
+
+def _form_fields(advanced):
+    result = asyncio.run(_flow(advanced).async_step_user())
+    fields = voluptuous_serialize.convert(
+        result["data_schema"], custom_serializer=cv.custom_serializer
+    )
+    return [field["name"] for field in fields]
+
+
+def test_form_serializes():
+    assert _form_fields(False) == ["username", "password"]
+
+
+def test_advanced_form_serializes():
+    assert _form_fields(True) == ["username", "password", "ucenter_url", "life2_url"]
+
+
+def test_invalid_url_rejected(monkeypatch):
+    async def check_auth(*args, **kwargs):
+        raise AssertionError("Should not try to log in")
+
+    monkeypatch.setattr(config_flow.API, "check_auth", check_auth)
+    result = asyncio.run(
+        _flow(True).async_step_user(
+            {
+                "username": "user",
+                "password": "pwd",
+                CONF_UCENTER_URL: "not a url",
+                CONF_LIFE2_URL: "http://127.0.0.1:8080",
+            }
+        )
+    )
+    assert result["errors"] == {CONF_UCENTER_URL: "invalid_url"}
+
+
+def test_default_urls_stored(monkeypatch):
+    logins = []
+
+    async def check_auth(username, password, ucenter_url):
+        logins.append(ucenter_url)
+
+    monkeypatch.setattr(config_flow.API, "check_auth", check_auth)
+    result = asyncio.run(
+        _flow(False).async_step_user({"username": "user", "password": "pwd"})
+    )
+    assert logins == [DEFAULT_UCENTER_URL]
+    assert result["data"][CONF_UCENTER_URL] == DEFAULT_UCENTER_URL
@@ -0,0 +1,45 @@
+from ..api import elements
+
+from .fixtures import bulbs
+
+
+def _data(bulb):
+    return elements._hassify_discovery(bulb)
+
+
+def test_restore_unchanged_sends_nothing():
+    current = _data(bulbs.BULB_W21N13)
+    snapshot = {key: current[key] for key in elements.SCENE_ATTRIBUTES}
+    assert elements._restore_updates(current, snapshot) == []
+
+
+def test_restore_off_only_sends_switch():
+    current = _data(bulbs.BULB_W21N13) | {"switch": "1", "brightness": "10"}
+    snapshot = {"switch": "0", "brightness": "100"}
+    assert elements._restore_updates(current, snapshot) == [
+        {"type": "switch", "value": "0"}
+    ]
+
+
+def test_restore_sends_only_differences():
+    current = _data(bulbs.BULB_W21N13)
+    snapshot = {
+        "switch": "1",
+        "brightness": "51",
+        "colorMode": "2",
+        "color": "1:2:3",
+        "colorTemperature": "80",
+    }
+    assert elements._restore_updates(current, snapshot) == [
+        {"type": "switch", "value": "1"},
+        {"type": "colorTemperature", "value": "80"},
+    ]
+
+
+def test_restore_color_mode_change():
+    current = _data(bulbs.BULB_W21N13)
+    snapshot = {"switch": "1", "colorMode": "1", "color": "193:142:255"}
+    assert elements._restore_updates(current, snapshot) == [
+        {"type": "switch", "value": "1"},
+        {"type": "color", "value": "193:142:255"},
+    ]
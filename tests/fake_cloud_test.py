@@ -0,0 +1,51 @@
+from .fixtures import fake_cloud
+
+
+def test_packet_round_trip():
+    buffer = bytearray(
+        fake_cloud.encode_packet(fake_cloud.MQTT_PUBLISH, 0, b"x" * 300)
+        + fake_cloud.encode_packet(fake_cloud.MQTT_PINGREQ, 0, b"")
+    )
+    assert fake_cloud.decode_packets(buffer) == [
+        (fake_cloud.MQTT_PUBLISH, 0, b"x" * 300),
+        (fake_cloud.MQTT_PINGREQ, 0, b""),
+    ]
+    assert buffer == bytearray()
+
+
+def test_partial_packet_stays_buffered():
+    packet = fake_cloud.encode_packet(fake_cloud.MQTT_PUBLISH, 0, b"payload")
+    buffer = bytearray(packet[:4])
+    assert fake_cloud.decode_packets(buffer) == []
+    buffer.extend(packet[4:])
+    assert fake_cloud.decode_packets(buffer) == [
+        (fake_cloud.MQTT_PUBLISH, 0, b"payload")
+    ]
+
+
+def test_topic_matches():
+    assert fake_cloud.topic_matches("wifielement/+/status", "wifielement/abc/status")
+    assert fake_cloud.topic_matches("wifielement/#", "wifielement/abc/status")
+    assert not fake_cloud.topic_matches("wifielement/+/status", "wifielement/abc/update")
+    assert not fake_cloud.topic_matches("wifielement/+", "wifielement/abc/status")
+
+
+def test_bulb_echoes_status():
+    bulb = fake_cloud.FakeBulb(1)
+    status = bulb.apply([{"type": "switch", "value": "1", "dn": bulb.uuid}])
+    assert [(s["type"], s["value"]) for s in status] == [("switch", "1")]
+    assert bulb.attributes["switch"] == "1"
+
+
+def test_subscription_index():
+    cloud = fake_cloud.FakeSengledCloud(bulb_count=0)
+    session = fake_cloud._MQTTSession(None)
+    cloud._subscribe(session, "wifielement/abc/status")
+    cloud._subscribe(session, "wifielement/+/status")
+    assert cloud._exact == {"wifielement/abc/status": {session}}
+    assert cloud._wildcard == {"wifielement/+/status": {session}}
+
+    cloud._unsubscribe(session, "wifielement/abc/status")
+    cloud._unsubscribe(session, "wifielement/+/status")
+    assert cloud._exact == {} and cloud._wildcard == {}
+    assert session.subscriptions == set()
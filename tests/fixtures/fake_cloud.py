@@ -0,0 +1,409 @@
+"""A local stand-in for the Sengled cloud, for offline end-to-end and load tests.
+
+Serves the login, server-info and device-list endpoints plus a minimal
+MQTT 3.1.1 broker over websockets, backed by any number of virtual
+``wifielement`` bulbs that answer ``update`` commands with ``status`` echoes.
+
+Point an ``API`` at it with ``ucenter_url=cloud.url, life2_url=cloud.url``, or
+run it standalone::
+
+    python tests/fixtures/fake_cloud.py --bulbs 5000 --port 8080
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+import json
+import logging
+import time
+from typing import Any
+import uuid
+
+from aiohttp import WSMsgType, web
+
+_LOGGER = logging.getLogger(__name__)
+
+MQTT_CONNECT = 1
+MQTT_CONNACK = 2
+MQTT_PUBLISH = 3
+MQTT_PUBACK = 4
+MQTT_SUBSCRIBE = 8
+MQTT_SUBACK = 9
+MQTT_UNSUBSCRIBE = 10
+MQTT_UNSUBACK = 11
+MQTT_PINGREQ = 12
+MQTT_PINGRESP = 13
+MQTT_DISCONNECT = 14
+
+CONNACK_ACCEPTED = 0
+CONNACK_NOT_AUTHORIZED = 5
+
+
+def encode_packet(packet_type: int, flags: int, body: bytes) -> bytes:
+    """Frame an MQTT control packet."""
+    header = bytearray([(packet_type << 4) | flags])
+    length = len(body)
+    while True:
+        digit, length = length % 128, length // 128
+        header.append(digit | 0x80 if length else digit)
+        if not length:
+            break
+    return bytes(header) + body
+
+
+def decode_packets(buffer: bytearray) -> list[tuple[int, int, bytes]]:
+    """Pop every complete packet off the front of buffer."""
+    packets = []
+    while len(buffer) >= 2:
+        length, multiplier, pos = 0, 1, 1
+        while True:
+            if pos >= len(buffer):
+                return packets
+            byte = buffer[pos]
+            length += (byte & 0x7F) * multiplier
+            multiplier *= 128
+            pos += 1
+            if not byte & 0x80:
+                break
+        if len(buffer) < pos + length:
+            return packets
+        packets.append((buffer[0] >> 4, buffer[0] & 0x0F, bytes(buffer[pos : pos + length])))
+        del buffer[: pos + length]
+    return packets
+
+
+def encode_string(value: str) -> bytes:
+    raw = value.encode()
+    return len(raw).to_bytes(2, "big") + raw
+
+
+def decode_string(body: bytes, pos: int) -> tuple[str, int]:
+    length = int.from_bytes(body[pos : pos + 2], "big")
+    return body[pos + 2 : pos + 2 + length].decode(), pos + 2 + length
+
+
+def topic_matches(topic_filter: str, topic: str) -> bool:
+    """MQTT wildcard matching for '+' and '#'."""
+    filter_parts = topic_filter.split("/")
+    topic_parts = topic.split("/")
+    for index, part in enumerate(filter_parts):
+        if part == "#":
+            return True
+        if index >= len(topic_parts):
+            return False
+        if part not in ("+", topic_parts[index]):
+            return False
+    return len(filter_parts) == len(topic_parts)
+
+
+class FakeBulb:
+    """A virtual wifielement bulb."""
+
+    def __init__(self, index: int, type_code: str = "W21-N13") -> None:
+        self.uuid = "FA:KE:{:02X}:{:02X}:{:02X}:{:02X}".format(
+            *index.to_bytes(4, "big")
+        )
+        self.type_code = type_code
+        self.attributes = {
+            "brightness": "100",
+            "color": "255:255:255",
+            "colorMode": "2",
+            "colorTemperature": "50",
+            "effectStatus": "0",
+            "name": "Fake Bulb {}".format(index),
+            "online": "1",
+            "productCode": "wifielement",
+            "switch": "0",
+            "typeCode": type_code,
+            "version": "v1.0.1.0",
+        }
+
+    def discovery(self) -> dict[str, Any]:
+        """The bulb as device/list.json returns it."""
+        return {
+            "deviceUuid": self.uuid,
+            "category": "wifielement",
+            "typeCode": self.type_code,
+            "attributeList": [
+                {"name": name, "value": value}
+                for name, value in self.attributes.items()
+            ],
+            "deviceAnimations": [],
+        }
+
+    def apply(self, updates: list[dict[str, Any]]) -> list[dict[str, str]]:
+        """Apply an update command and build the status echo."""
+        status = []
+        for update in updates:
+            self.attributes[update["type"]] = update["value"]
+            status.append(
+                {
+                    "dn": self.uuid,
+                    "type": update["type"],
+                    "value": update["value"],
+                    "time": int(time.time() * 1000),
+                }
+            )
+        return status
+
+
+class _MQTTSession:
+    """One connected websocket MQTT client."""
+
+    def __init__(self, ws: web.WebSocketResponse) -> None:
+        self.ws = ws
+        self.client_id: str | None = None
+        self.subscriptions: set[str] = set()
+
+    async def send(self, packet_type: int, flags: int, body: bytes) -> None:
+        await self.ws.send_bytes(encode_packet(packet_type, flags, body))
+
+
+class FakeSengledCloud:
+    """The login/server-info/device-list endpoints and an MQTT websocket broker."""
+
+    def __init__(
+        self,
+        bulb_count: int = 1000,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        reply_delay: float = 0.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.reply_delay = reply_delay
+        self.bulbs = {bulb.uuid: bulb for bulb in map(FakeBulb, range(bulb_count))}
+        self.stats: Counter[str] = Counter()
+        self._jsessions: set[str] = set()
+        self._sessions: set[_MQTTSession] = set()
+        # Exact topics are looked up directly; only wildcard filters are scanned.
+        self._exact: dict[str, set[_MQTTSession]] = {}
+        self._wildcard: dict[str, set[_MQTTSession]] = {}
+        self._delayed: set[asyncio.Task] = set()
+        self._runner: web.AppRunner | None = None
+
+        self.app = web.Application()
+        self.app.router.add_post(
+            "/user/app/customer/v2/AuthenCross.json", self._handle_login
+        )
+        self.app.router.add_post(
+            "/life2/server/getServerInfo.json", self._handle_server_info
+        )
+        self.app.router.add_post("/life2/device/list.json", self._handle_device_list)
+        self.app.router.add_get("/mqtt", self._handle_mqtt)
+
+    @property
+    def url(self) -> str:
+        """Base URL to hand to API as both ucenter_url and life2_url."""
+        return "http://{}:{}".format(self.host, self.port)
+
+    async def start(self) -> None:
+        """Start serving; picks a free port if none was given."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if not self.port:
+            self.port = site._server.sockets[0].getsockname()[1]
+        _LOGGER.info("Fake Sengled cloud on %s with %d bulbs", self.url, len(self.bulbs))
+
+    async def stop(self) -> None:
+        for task in tuple(self._delayed):
+            task.cancel()
+        await self.drop_clients()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def drop_clients(self) -> None:
+        """Close every MQTT connection, e.g. to provoke a reconnect storm."""
+        for session in tuple(self._sessions):
+            await session.ws.close()
+
+    def expire_sessions(self) -> None:
+        """Forget issued JSESSIONIDs so reconnects are refused until re-login."""
+        self._jsessions.clear()
+
+    async def _handle_login(self, request: web.Request) -> web.Response:
+        self.stats["login"] += 1
+        payload = await request.json()
+        if not payload.get("user") or not payload.get("pwd"):
+            return web.json_response({"ret": 1, "msg": "bad credentials"})
+        jsession_id = uuid.uuid4().hex
+        self._jsessions.add(jsession_id)
+        return web.json_response({"ret": 0, "msg": "OK", "jsessionId": jsession_id})
+
+    async def _handle_server_info(self, request: web.Request) -> web.Response:
+        self.stats["server_info"] += 1
+        return web.json_response(
+            {
+                "messageCode": "200",
+                "info": "OK",
+                "jbalancerAddr": "{}/jbalancer/new/bimqtt".format(self.url),
+                "inceptionAddr": "ws://{}:{}/mqtt".format(self.host, self.port),
+                "success": True,
+            }
+        )
+
+    async def _handle_device_list(self, request: web.Request) -> web.Response:
+        self.stats["device_list"] += 1
+        return web.json_response(
+            {"deviceList": [bulb.discovery() for bulb in self.bulbs.values()]}
+        )
+
+    async def _handle_mqtt(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(protocols=("mqtt",))
+        await ws.prepare(request)
+        jsession_id = request.cookies.get("JSESSIONID")
+        session = _MQTTSession(ws)
+        self._sessions.add(session)
+        buffer = bytearray()
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.BINARY:
+                    break
+                buffer.extend(msg.data)
+                for packet_type, flags, body in decode_packets(buffer):
+                    if not await self._handle_packet(
+                        session, jsession_id, packet_type, flags, body
+                    ):
+                        await ws.close()
+                        break
+        finally:
+            self._sessions.discard(session)
+            for topic_filter in tuple(session.subscriptions):
+                self._unsubscribe(session, topic_filter)
+        return ws
+
+    def _subscriptions_for(self, topic_filter: str) -> dict[str, set[_MQTTSession]]:
+        if "+" in topic_filter or "#" in topic_filter:
+            return self._wildcard
+        return self._exact
+
+    def _subscribe(self, session: _MQTTSession, topic_filter: str) -> None:
+        session.subscriptions.add(topic_filter)
+        self._subscriptions_for(topic_filter).setdefault(topic_filter, set()).add(
+            session
+        )
+
+    def _unsubscribe(self, session: _MQTTSession, topic_filter: str) -> None:
+        session.subscriptions.discard(topic_filter)
+        index = self._subscriptions_for(topic_filter)
+        sessions = index.get(topic_filter)
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del index[topic_filter]
+
+    async def _handle_packet(
+        self,
+        session: _MQTTSession,
+        jsession_id: str | None,
+        packet_type: int,
+        flags: int,
+        body: bytes,
+    ) -> bool:
+        """Handle one packet, returning False when the connection should close."""
+        if packet_type == MQTT_CONNECT:
+            self.stats["connect"] += 1
+            _, pos = decode_string(body, 0)  # Protocol name
+            session.client_id, _ = decode_string(body, pos + 4)
+            if jsession_id not in self._jsessions:
+                self.stats["connect_refused"] += 1
+                await session.send(MQTT_CONNACK, 0, bytes([0, CONNACK_NOT_AUTHORIZED]))
+                return False
+            await session.send(MQTT_CONNACK, 0, bytes([0, CONNACK_ACCEPTED]))
+        elif packet_type == MQTT_SUBSCRIBE:
+            packet_id, pos, granted = body[:2], 2, bytearray()
+            while pos < len(body):
+                topic_filter, pos = decode_string(body, pos)
+                pos += 1  # Requested QoS; we only ever grant 0
+                self._subscribe(session, topic_filter)
+                granted.append(0)
+            await session.send(MQTT_SUBACK, 0, packet_id + bytes(granted))
+        elif packet_type == MQTT_UNSUBSCRIBE:
+            packet_id, pos = body[:2], 2
+            while pos < len(body):
+                topic_filter, pos = decode_string(body, pos)
+                self._unsubscribe(session, topic_filter)
+            await session.send(MQTT_UNSUBACK, 0, packet_id)
+        elif packet_type == MQTT_PUBLISH:
+            topic, pos = decode_string(body, 0)
+            if (flags >> 1) & 0x03:
+                await session.send(MQTT_PUBACK, 0, body[pos : pos + 2])
+                pos += 2
+            await self._handle_publish(topic, body[pos:])
+        elif packet_type == MQTT_PINGREQ:
+            await session.send(MQTT_PINGRESP, 0, b"")
+        elif packet_type == MQTT_DISCONNECT:
+            return False
+        else:
+            _LOGGER.warning("Unhandled MQTT packet type %d", packet_type)
+        return True
+
+    async def _handle_publish(self, topic: str, payload: bytes) -> None:
+        self.stats["publish"] += 1
+        await self._route(topic, payload)
+
+        parts = topic.split("/")
+        if len(parts) != 3 or parts[0] != "wifielement" or parts[2] != "update":
+            return
+        bulb = self.bulbs.get(parts[1])
+        if not bulb:
+            _LOGGER.warning("Update for unknown bulb %s", parts[1])
+            return
+        status = bulb.apply(json.loads(payload))
+        if self.reply_delay:
+            # Don't hold up the rest of this connection's packets.
+            task = asyncio.create_task(
+                self._echo_status(bulb, status, self.reply_delay)
+            )
+            self._delayed.add(task)
+            task.add_done_callback(self._delayed.discard)
+        else:
+            await self._echo_status(bulb, status)
+
+    async def _echo_status(
+        self, bulb: FakeBulb, status: list[dict[str, str]], delay: float = 0.0
+    ) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        self.stats["status"] += 1
+        await self._route(
+            "wifielement/{}/status".format(bulb.uuid), json.dumps(status).encode()
+        )
+
+    async def _route(self, topic: str, payload: bytes) -> None:
+        sessions = set(self._exact.get(topic, ()))
+        for topic_filter, subscribers in self._wildcard.items():
+            if topic_matches(topic_filter, topic):
+                sessions.update(subscribers)
+        if not sessions:
+            return
+        packet = encode_packet(MQTT_PUBLISH, 0, encode_string(topic) + payload)
+        for session in sessions:
+            if not session.ws.closed:
+                await session.ws.send_bytes(packet)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    cloud = FakeSengledCloud(args.bulbs, args.host, args.port, args.reply_delay)
+    await cloud.start()
+    print("Serving {} bulbs at {}".format(len(cloud.bulbs), cloud.url))
+    try:
+        while True:
+            await asyncio.sleep(60)
+            print(dict(cloud.stats))
+    finally:
+        await cloud.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bulbs", type=int, default=1000)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--reply-delay", type=float, default=0.0)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_serve(parser.parse_args()))
@@ -0,0 +1,46 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .. import profiler
+
+
+def _hass(tmp_path):
+    async def async_add_executor_job(target, *args):
+        return target(*args)
+
+    return SimpleNamespace(
+        config=SimpleNamespace(path=lambda name: str(tmp_path / name)),
+        async_add_executor_job=async_add_executor_job,
+    )
+
+
+def test_profile_writes_report(tmp_path):
+    path = asyncio.run(profiler.async_profile(_hass(tmp_path), 0.01))
+    with open(path, encoding="utf-8") as report:
+        assert report.read().startswith("SengledNG profile over 0.01 seconds")
+
+
+def test_profile_rejects_concurrent_runs(tmp_path):
+    async def run():
+        hass = _hass(tmp_path)
+        first = asyncio.create_task(profiler.async_profile(hass, 0.1))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HomeAssistantError):
+            await profiler.async_profile(hass, 0.1)
+        await first
+
+    asyncio.run(run())
+
+
+def test_profile_reports_busy_profiler(tmp_path, monkeypatch):
+    class BusyProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiler.cProfile, "Profile", BusyProfile)
+    with pytest.raises(HomeAssistantError):
+        asyncio.run(profiler.async_profile(_hass(tmp_path), 0.01))